@@ -9,11 +9,136 @@ Description: Professional installer for SpeedNetworkMapper with global command s
 
 import os
 import sys
+import ast
 import subprocess
 import shutil
 import stat
+import json
+import hashlib
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import resource
+except ImportError:  # Not available outside Unix
+    resource = None
+
+# Installer banner and completion message, assembled once at import
+_BANNER = """
+╔════════════════════════════════════════════════════════════════╗
+║              ⚡ SpeedNetworkMapper Installer                    ║
+║           Ultra-Fast Network Discovery Tool Setup             ║
+╠════════════════════════════════════════════════════════════════╣
+║  • Global command installation (snm)                          ║
+║  • System requirements checking                               ║
+║  • Bash completion setup                                      ║
+║  • Performance optimization                                   ║
+╚════════════════════════════════════════════════════════════════╝
+
+"""
+
+_COMPLETION_MESSAGE = """
+======================================================================
+🎉 SpeedNetworkMapper Installation Complete!
+======================================================================
+
+🚀 Quick Start Commands:
+   snm --help                    # Show help
+   snm quick 192.168.1.0/24      # Quick network scan
+   sudo snm full 10.0.0.0/16     # Full network scan
+   snm stealth 172.16.0.0/12     # Stealth scan
+
+📁 Installation Details:
+   • Command: {bin_path}
+   • Scripts: {install_dir}
+   • Completion: {completion_script}
+
+⚡ Performance Tips:
+   • Use 'sudo' for maximum performance
+   • Start with 'snm quick' for local network
+   • Export results: snm quick 192.168.1.0/24 --export json
+
+🔧 Advanced Usage:
+   • All ports: snm all 192.168.1.100/32
+   • Stealth mode: snm stealth 10.0.0.0/24
+   • Large networks: sudo snm full 10.0.0.0/8
+
+🗑️  To Uninstall:
+   sudo python3 installer.py uninstall
+
+✨ Happy Network Mapping!
+"""
+
+# Global command wrapper, filled in with the installation paths
+_WRAPPER_TEMPLATE = '''#!/bin/bash
+# SpeedNetworkMapper Global Command Wrapper
+# Usage: snm [options]
+
+SCRIPT_DIR="{install_dir}"
+PYTHON_SCRIPT="$SCRIPT_DIR/{script_name}"
+
+# Check if script exists
+if [ ! -f "$PYTHON_SCRIPT" ]; then
+    echo "❌ Error: SpeedNetworkMapper not found at $PYTHON_SCRIPT"
+    echo "   Try reinstalling: sudo python3 installer.py"
+    exit 1
+fi
+
+# Check if running as root for certain operations
+if [ "$EUID" -ne 0 ] && [[ "$1" != "quick" ]] && [[ "$1" != "--help" ]] && [[ "$1" != "-h" ]]; then
+    echo "⚠️  Some network operations may require root privileges"
+    echo "   For full functionality, try: sudo snm $@"
+fi
+
+# Execute the Python script
+exec python3 "$PYTHON_SCRIPT" "$@"
+'''
+
+# Word lists for bash completion, one per line: commands, export formats,
+# network suggestions (common private ranges), general options
+_COMPLETION_WORDS = '''quick full all stealth --help -h
+json csv
+192.168.1.0/24 192.168.0.0/24 10.0.0.0/16 172.16.0.0/12
+--export --help
+'''
+
+# Bash completion for the snm command, reads the word lists installed above
+_COMPLETION_SCRIPT = '''# SpeedNetworkMapper bash completion
+_snm_completion() {{
+    local cur prev words
+    COMPREPLY=()
+    cur="${{COMP_WORDS[COMP_CWORD]}}"
+    prev="${{COMP_WORDS[COMP_CWORD-1]}}"
+
+    mapfile -t words 2>/dev/null < {completion_data} || return 0
+
+    # Main commands
+    if [[ ${{COMP_CWORD}} == 1 ]]; then
+        COMPREPLY=( $(compgen -W "${{words[0]}}" -- ${{cur}}) )
+        return 0
+    fi
+
+    # Options for export
+    if [[ ${{prev}} == "--export" ]]; then
+        COMPREPLY=( $(compgen -W "${{words[1]}}" -- ${{cur}}) )
+        return 0
+    fi
+
+    # Network suggestions
+    if [[ ${{COMP_CWORD}} == 2 ]]; then
+        COMPREPLY=( $(compgen -W "${{words[2]}}" -- ${{cur}}) )
+        return 0
+    fi
+
+    # General options
+    COMPREPLY=( $(compgen -W "${{words[3]}}" -- ${{cur}}) )
+}}
+
+complete -F _snm_completion snm
+'''
+
 class SNMInstaller:
     """Professional installer for SpeedNetworkMapper"""
     
@@ -23,21 +148,27 @@ class SNMInstaller:
         self.install_dir = Path("/opt/speednetworkmapper")
         self.bin_path = Path("/usr/local/bin") / self.command_name
         self.completion_script = Path("/etc/bash_completion.d/snm")
+        self.config_dir = Path("/etc/snm")
+        self.completion_data = self.config_dir / "completions.dat"
+        self.cache_dir = Path("/var/cache/snm")
+        self.which_cache = self.cache_dir / "which.json"
+        self.apt_update_stamp = self.cache_dir / "apt_update.stamp"
+        self.apt_lists_dir = Path("/var/lib/apt/lists")
+        self.apt_env = {**os.environ, 'DEBIAN_FRONTEND': 'noninteractive'}
+        self.deep_test = False
+        
+        # Only report per-step details on an interactive terminal
+        self.chatty = sys.stdout.isatty()
+        
+        # Soft open file limit, fixed for the lifetime of the installer
+        self.nofile_limit = None
+        if resource is not None:
+            self.nofile_limit = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
         
     def print_banner(self):
         """Display installer banner"""
-        banner = """
-╔════════════════════════════════════════════════════════════════╗
-║              ⚡ SpeedNetworkMapper Installer                    ║
-║           Ultra-Fast Network Discovery Tool Setup             ║
-╠════════════════════════════════════════════════════════════════╣
-║  • Global command installation (snm)                          ║
-║  • System requirements checking                               ║
-║  • Bash completion setup                                      ║
-║  • Performance optimization                                   ║
-╚════════════════════════════════════════════════════════════════╝
-        """
-        print(banner)
+        if self.chatty:
+            sys.stdout.write(_BANNER)
     
     def check_prerequisites(self):
         """Check system requirements"""
@@ -60,12 +191,110 @@ class SNMInstaller:
             print(f"   Current version: {sys.version}")
             return False
         
-        print(f"✅ Linux system detected")
-        print(f"✅ Python {sys.version.split()[0]} is compatible")
-        print(f"✅ Running with sufficient privileges")
+        self._write_lines([
+            "✅ Linux system detected",
+            f"✅ Python {sys.version.split()[0]} is compatible",
+            "✅ Running with sufficient privileges",
+        ])
         
         return True
     
+    def _write_lines(self, lines):
+        """Write a batch of detail lines with a single write call (TTY only)"""
+        if self.chatty and lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
+    
+    def _which_cache_key(self):
+        """Fingerprint PATH and the mtimes of every directory on it"""
+        path = os.environ.get('PATH', os.defpath)
+        key = hashlib.sha1(path.encode())
+        for bin_dir in path.split(os.pathsep):
+            try:
+                key.update(str(os.stat(bin_dir).st_mtime_ns).encode())
+            except OSError:
+                key.update(b'-')
+        return key.hexdigest()
+    
+    def _locate_tools(self, tools):
+        """Resolve tool paths, reusing the on-disk cache when still valid"""
+        key = self._which_cache_key()
+        
+        try:
+            with open(self.which_cache, 'r') as f:
+                cached = json.load(f)
+            if cached.get('key') == key and all(tool in cached['tools'] for tool in tools):
+                return cached['tools']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        
+        located = {tool: shutil.which(tool) for tool in tools}
+        
+        # Write atomically so a concurrent run never sees a partial file
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'key': key, 'tools': located}, f)
+            os.replace(tmp_path, self.which_cache)
+        except OSError:
+            pass
+        
+        return located
+    
+    def _apt(self, command, *packages):
+        """Build a non-interactive apt-get command line"""
+        cmd = ['apt-get', '-y',
+               '-o', 'Dpkg::Use-Pty=0',
+               '-o', 'APT::Install-Recommends=0',
+               '-o', 'APT::Install-Suggests=0',
+               # Don't fsync every unpacked file
+               '-o', 'Dpkg::Options::=--force-unsafe-io',
+               command, *packages]
+        if shutil.which('eatmydata'):
+            cmd.insert(0, 'eatmydata')
+        return cmd
+    
+    def _apt_lists_stale(self, max_age=86400):
+        """Check whether the apt package lists are older than max_age seconds"""
+        # Lists cleaned out (e.g. rm -rf /var/lib/apt/lists/*) leave a fresh
+        # directory mtime but nothing to install from
+        if not any(self.apt_lists_dir.glob('*_Packages*')):
+            return True
+        
+        last_update = 0
+        for marker in (self.apt_lists_dir, self.apt_lists_dir / "partial", self.apt_update_stamp):
+            try:
+                last_update = max(last_update, os.stat(marker).st_mtime)
+            except OSError:
+                pass
+        
+        return time.time() - last_update > max_age
+    
+    def _touch_apt_update_stamp(self):
+        """Record a successful apt-get update"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.apt_update_stamp.touch()
+        except OSError:
+            pass
+    
+    def _installed_packages(self, packages):
+        """Query dpkg once for which of the given packages are installed"""
+        if not packages or not shutil.which('dpkg-query'):
+            return set()
+        
+        result = subprocess.run(
+            ['dpkg-query', '-W', '-f=${Package} ${Status}\n', *packages],
+            capture_output=True, text=True, close_fds=False
+        )
+        
+        installed = set()
+        for line in result.stdout.splitlines():
+            if line.endswith(' install ok installed'):
+                installed.add(line.split()[0])
+        return installed
+    
     def check_system_tools(self):
         """Check and install required system tools"""
         print("🔧 Checking system tools...")
@@ -76,56 +305,68 @@ class SNMInstaller:
         missing_required = []
         missing_optional = []
         
+        located = self._locate_tools(required_tools + optional_tools)
+        lines = []
+        errors = []
+        
         # Check required tools
         for tool in required_tools:
-            try:
-                subprocess.run(['which', tool], check=True, 
-                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                print(f"✅ {tool} found")
-            except subprocess.CalledProcessError:
+            if located[tool]:
+                lines.append(f"✅ {tool} found")
+            else:
                 missing_required.append(tool)
-                print(f"❌ {tool} missing (required)")
+                errors.append(f"❌ {tool} missing (required)")
         
         # Check optional tools
         for tool in optional_tools:
-            try:
-                subprocess.run(['which', tool], check=True, 
-                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                print(f"✅ {tool} found (optional)")
-            except subprocess.CalledProcessError:
+            if located[tool]:
+                lines.append(f"✅ {tool} found (optional)")
+            else:
                 missing_optional.append(tool)
-                print(f"⚠️  {tool} missing (optional)")
+                lines.append(f"⚠️  {tool} missing (optional)")
+        
+        self._write_lines(lines)
+        
+        # Errors are shown even when stdout is not a terminal
+        for error in errors:
+            print(error)
         
         # Install missing tools
         if missing_required or missing_optional:
             missing_all = missing_required + missing_optional
             print(f"📦 Installing missing tools: {', '.join(missing_all)}")
             
+            # Map missing tools to the packages that provide them
+            packages = []
+            if any(tool in missing_all for tool in ['arp', 'netstat']):
+                packages.append('net-tools')
+            if 'ping' in missing_all:
+                packages.append('iputils-ping')
+            if 'nmap' in missing_optional:
+                packages.append('nmap')
+            if any(tool in missing_optional for tool in ['dig', 'whois']):
+                packages.extend(['dnsutils', 'whois'])
+            packages = list(dict.fromkeys(packages))
+            
+            # Tools can be missing from PATH while their package is installed
+            installed = self._installed_packages(packages)
+            packages = [pkg for pkg in packages if pkg not in installed]
+            if not packages:
+                self._write_lines(["✅ Packages already installed, skipping apt"])
+                return True
+            
             try:
-                # Update package list
-                subprocess.run(['apt', 'update'], check=True, 
-                             stdout=subprocess.DEVNULL)
-                
-                # Install net-tools (contains arp, netstat)
-                if any(tool in missing_all for tool in ['arp', 'netstat']):
-                    subprocess.run(['apt', 'install', '-y', 'net-tools'], 
-                                 check=True)
+                # Update package list unless it was refreshed recently
+                if self._apt_lists_stale():
+                    subprocess.run(self._apt('update'), check=True,
+                                 stdout=subprocess.DEVNULL, env=self.apt_env)
+                    self._touch_apt_update_stamp()
                 
-                # Install iputils-ping
-                if 'ping' in missing_all:
-                    subprocess.run(['apt', 'install', '-y', 'iputils-ping'], 
-                                 check=True)
+                # Install everything in a single apt transaction
+                subprocess.run(self._apt('install', *packages), check=True,
+                             env=self.apt_env)
                 
-                # Install optional tools
-                if 'nmap' in missing_optional:
-                    subprocess.run(['apt', 'install', '-y', 'nmap'], 
-                                 check=True)
-                
-                if any(tool in missing_optional for tool in ['dig', 'whois']):
-                    subprocess.run(['apt', 'install', '-y', 'dnsutils', 'whois'], 
-                                 check=True)
-                
-                print("✅ System tools installed successfully")
+                self._write_lines(["✅ System tools installed successfully"])
                 
             except subprocess.CalledProcessError as e:
                 print(f"⚠️  Could not install some tools: {e}")
@@ -135,6 +376,33 @@ class SNMInstaller:
         
         return True
     
+    def _run_pip(self, *args):
+        """Run pip in-process, falling back to a subprocess"""
+        try:
+            from pip._internal.cli.main import main as pip_main
+        except ImportError:
+            subprocess.run([sys.executable, '-m', 'pip', *args],
+                         check=True, stdout=subprocess.DEVNULL)
+            return
+        
+        # pip's internal API is not stable, so mirror the subprocess contract
+        returncode = pip_main(['--quiet', *args])
+        if returncode:
+            raise subprocess.CalledProcessError(returncode, ['pip', *args])
+    
+    def _pip_install(self, *requirements):
+        """Fetch wheels first, then install them offline in one pass"""
+        with tempfile.TemporaryDirectory(prefix='snm-wheels-') as wheel_dir:
+            # pip wheel also builds sdist-only requirements while the index
+            # (and their build dependencies) is still reachable
+            self._run_pip('wheel', '--progress-bar', 'off', '--wheel-dir', wheel_dir,
+                          '--prefer-binary', *requirements)
+            
+            # Bytecode is compiled lazily on first import instead
+            self._run_pip('install', '--progress-bar', 'off', '--upgrade', '--no-index',
+                          '--find-links', wheel_dir, '--no-compile',
+                          *requirements)
+    
     def install_python_dependencies(self):
         """Install Python dependencies"""
         print("🐍 Installing Python dependencies...")
@@ -145,22 +413,16 @@ class SNMInstaller:
             print("⚠️  requirements.txt not found, installing basic dependencies...")
             # Install minimal dependencies manually
             try:
-                subprocess.run([
-                    sys.executable, '-m', 'pip', 'install', 
-                    'colorama', 'tqdm', 'psutil', '--upgrade'
-                ], check=True, stdout=subprocess.DEVNULL)
-                print("✅ Basic dependencies installed")
+                self._pip_install('colorama', 'tqdm', 'psutil')
+                self._write_lines(["✅ Basic dependencies installed"])
             except subprocess.CalledProcessError:
                 print("⚠️  Could not install optional dependencies (will work without them)")
             return True
         
         try:
             # Install from requirements.txt
-            subprocess.run([
-                sys.executable, '-m', 'pip', 'install', 
-                '-r', str(requirements_file), '--upgrade'
-            ], check=True, stdout=subprocess.DEVNULL)
-            print("✅ Python dependencies installed")
+            self._pip_install('-r', str(requirements_file))
+            self._write_lines(["✅ Python dependencies installed"])
             return True
             
         except subprocess.CalledProcessError as e:
@@ -175,7 +437,7 @@ class SNMInstaller:
         try:
             self.install_dir.mkdir(parents=True, exist_ok=True)
             self.install_dir.chmod(0o755)
-            print(f"✅ Directory created: {self.install_dir}")
+            self._write_lines([f"✅ Directory created: {self.install_dir}"])
             return True
         except Exception as e:
             print(f"❌ Failed to create directory: {e}")
@@ -193,9 +455,14 @@ class SNMInstaller:
         
         try:
             dest_script = self.install_dir / self.script_name
-            shutil.copy2(source_script, dest_script)
+            if dest_script.exists():
+                dest_script.unlink()
+            
+            # Always a separate copy (sendfile on Linux), never a hardlink
+            # to the user's checkout
+            shutil.copyfile(source_script, dest_script)
             dest_script.chmod(0o755)
-            print(f"✅ Script installed: {dest_script}")
+            self._write_lines([f"✅ Script installed: {dest_script}"])
             return True
         except Exception as e:
             print(f"❌ Failed to install script: {e}")
@@ -205,88 +472,39 @@ class SNMInstaller:
         """Create global command wrapper"""
         print(f"🔗 Creating global command: {self.command_name}")
         
-        wrapper_content = f'''#!/bin/bash
-# SpeedNetworkMapper Global Command Wrapper
-# Usage: snm [options]
-
-SCRIPT_DIR="{self.install_dir}"
-PYTHON_SCRIPT="$SCRIPT_DIR/{self.script_name}"
-
-# Check if script exists
-if [ ! -f "$PYTHON_SCRIPT" ]; then
-    echo "❌ Error: SpeedNetworkMapper not found at $PYTHON_SCRIPT"
-    echo "   Try reinstalling: sudo python3 installer.py"
-    exit 1
-fi
-
-# Check if running as root for certain operations
-if [ "$EUID" -ne 0 ] && [[ "$1" != "quick" ]] && [[ "$1" != "--help" ]] && [[ "$1" != "-h" ]]; then
-    echo "⚠️  Some network operations may require root privileges"
-    echo "   For full functionality, try: sudo snm $@"
-fi
-
-# Execute the Python script
-exec python3 "$PYTHON_SCRIPT" "$@"
-'''
+        wrapper_content = _WRAPPER_TEMPLATE.format(install_dir=self.install_dir,
+                                                   script_name=self.script_name)
         
         try:
-            with open(self.bin_path, 'w') as f:
-                f.write(wrapper_content)
-            
+            self.bin_path.write_text(wrapper_content)
             self.bin_path.chmod(0o755)
-            print(f"✅ Global command created: {self.bin_path}")
+            self._write_lines([f"✅ Global command created: {self.bin_path}"])
             return True
         except Exception as e:
             print(f"❌ Failed to create command: {e}")
             return False
     
+    def _setup_files(self):
+        """Create the installation directory, script and command wrapper"""
+        return (self.create_installation_directory()
+                and self.install_main_script()
+                and self.create_command_wrapper())
+    
     def setup_bash_completion(self):
         """Setup bash completion for snm command"""
         print("⚡ Setting up bash completion...")
         
-        completion_content = '''# SpeedNetworkMapper bash completion
-_snm_completion() {
-    local cur prev opts
-    COMPREPLY=()
-    cur="${COMP_WORDS[COMP_CWORD]}"
-    prev="${COMP_WORDS[COMP_CWORD-1]}"
-
-    # Main commands
-    if [[ ${COMP_CWORD} == 1 ]]; then
-        opts="quick full all stealth --help -h"
-        COMPREPLY=( $(compgen -W "${opts}" -- ${cur}) )
-        return 0
-    fi
-
-    # Options for export
-    if [[ ${prev} == "--export" ]]; then
-        opts="json csv"
-        COMPREPLY=( $(compgen -W "${opts}" -- ${cur}) )
-        return 0
-    fi
-
-    # Network suggestions (common private ranges)
-    if [[ ${COMP_CWORD} == 2 ]]; then
-        local networks="192.168.1.0/24 192.168.0.0/24 10.0.0.0/16 172.16.0.0/12"
-        COMPREPLY=( $(compgen -W "${networks}" -- ${cur}) )
-        return 0
-    fi
-
-    # General options
-    opts="--export --help"
-    COMPREPLY=( $(compgen -W "${opts}" -- ${cur}) )
-}
-
-complete -F _snm_completion snm
-'''
-        
         try:
-            with open(self.completion_script, 'w') as f:
-                f.write(completion_content)
-            
+            self.config_dir.mkdir(parents=True, exist_ok=True)
+            self.completion_data.write_text(_COMPLETION_WORDS)
+            self.completion_data.chmod(0o644)
+            self.completion_script.write_text(
+                _COMPLETION_SCRIPT.format(completion_data=self.completion_data))
             self.completion_script.chmod(0o644)
-            print(f"✅ Bash completion installed")
-            print("   Restart your terminal or run: source /etc/bash_completion.d/snm")
+            self._write_lines([
+                "✅ Bash completion installed",
+                "   Restart your terminal or run: source /etc/bash_completion.d/snm",
+            ])
         except Exception as e:
             print(f"⚠️  Could not install bash completion: {e}")
         
@@ -299,27 +517,16 @@ complete -F _snm_completion snm
         optimizations = []
         
         # Check if we can increase file descriptor limits
-        try:
-            import resource
-            current_limit = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
-            if current_limit < 65536:
-                optimizations.append(f"Consider increasing file descriptor limit: ulimit -n 65536")
-        except:
-            pass
+        if self.nofile_limit is not None and self.nofile_limit < 65536:
+            optimizations.append(f"Consider increasing file descriptor limit: ulimit -n 65536")
         
         # Check available memory
         try:
-            with open('/proc/meminfo', 'r') as f:
-                meminfo = f.read()
-            
-            for line in meminfo.split('\n'):
-                if 'MemTotal:' in line:
-                    mem_kb = int(line.split()[1])
-                    mem_gb = mem_kb / 1024 / 1024
-                    if mem_gb < 4:
-                        optimizations.append(f"Low memory detected ({mem_gb:.1f}GB) - consider reducing concurrent scans")
-                    break
-        except:
+            mem_bytes = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+            mem_gb = mem_bytes / (1024 ** 3)
+            if mem_gb < 4:
+                optimizations.append(f"Low memory detected ({mem_gb:.1f}GB) - consider reducing concurrent scans")
+        except (ValueError, OSError):
             pass
         
         # Check if we can optimize network stack
@@ -330,31 +537,55 @@ complete -F _snm_completion snm
             "net.ipv4.tcp_wmem=4096 65536 134217728"
         ]
         
-        print("✅ Performance analysis completed")
+        lines = ["✅ Performance analysis completed"]
         
         if optimizations:
-            print("💡 Performance recommendations:")
-            for opt in optimizations:
-                print(f"   • {opt}")
+            lines.append("💡 Performance recommendations:")
+            lines.extend(f"   • {opt}" for opt in optimizations)
         
-        print("💡 For maximum performance, consider:")
-        print("   • Run with root privileges: sudo snm")
-        print("   • Increase file descriptors: ulimit -n 65536")
-        print("   • Use SSD storage for better I/O")
+        lines.extend([
+            "💡 For maximum performance, consider:",
+            "   • Run with root privileges: sudo snm",
+            "   • Increase file descriptors: ulimit -n 65536",
+            "   • Use SSD storage for better I/O",
+        ])
+        self._write_lines(lines)
         
         return True
     
+    def _check_installed_files(self):
+        """Verify the installed script parses and the command is executable"""
+        try:
+            script = self.install_dir / self.script_name
+            ast.parse(script.read_text(), filename=str(script))
+        except SyntaxError as e:
+            print(f"⚠️  Installed script has a syntax error: {e}")
+            return False
+        except Exception as e:
+            print(f"⚠️  Could not test installation: {e}")
+            return False
+        
+        if not os.access(self.bin_path, os.X_OK):
+            print(f"⚠️  Command is not executable: {self.bin_path}")
+            return False
+        
+        self._write_lines(["✅ Installation test passed"])
+        return True
+    
     def test_installation(self):
         """Test the installation"""
         print("🧪 Testing installation...")
         
+        if not self.deep_test:
+            return self._check_installed_files()
+        
         try:
             # Test command availability
             result = subprocess.run([str(self.bin_path), '--help'], 
                                   capture_output=True, text=True, timeout=10)
             
             if result.returncode == 0 and 'SpeedNetworkMapper' in result.stdout:
-                print("✅ Installation test passed")
+                self._write_lines(["✅ Installation test passed"])
                 return True
             else:
                 print("⚠️  Installation test had issues")
@@ -371,35 +602,9 @@ complete -F _snm_completion snm
     
     def display_completion_message(self):
         """Display installation completion message"""
-        print("\n" + "="*70)
-        print("🎉 SpeedNetworkMapper Installation Complete!")
-        print("="*70)
-        
-        print(f"\n🚀 Quick Start Commands:")
-        print(f"   snm --help                    # Show help")
-        print(f"   snm quick 192.168.1.0/24      # Quick network scan")
-        print(f"   sudo snm full 10.0.0.0/16     # Full network scan")
-        print(f"   snm stealth 172.16.0.0/12     # Stealth scan")
-        
-        print(f"\n📁 Installation Details:")
-        print(f"   • Command: {self.bin_path}")
-        print(f"   • Scripts: {self.install_dir}")
-        print(f"   • Completion: {self.completion_script}")
-        
-        print(f"\n⚡ Performance Tips:")
-        print(f"   • Use 'sudo' for maximum performance")
-        print(f"   • Start with 'snm quick' for local network")
-        print(f"   • Export results: snm quick 192.168.1.0/24 --export json")
-        
-        print(f"\n🔧 Advanced Usage:")
-        print(f"   • All ports: snm all 192.168.1.100/32")
-        print(f"   • Stealth mode: snm stealth 10.0.0.0/24")
-        print(f"   • Large networks: sudo snm full 10.0.0.0/8")
-        
-        print(f"\n🗑️  To Uninstall:")
-        print(f"   sudo python3 installer.py uninstall")
-        
-        print("\n✨ Happy Network Mapping!")
+        if self.chatty:
+            sys.stdout.write(_COMPLETION_MESSAGE.format_map(vars(self)))
+            sys.stdout.flush()
     
     def install(self):
         """Main installation process"""
@@ -408,19 +613,19 @@ complete -F _snm_completion snm
         if not self.check_prerequisites():
             return False
         
-        if not self.check_system_tools():
-            return False
-        
-        if not self.install_python_dependencies():
-            return False
-        
-        if not self.create_installation_directory():
-            return False
+        # System packages and Python packages are independent, so apt runs
+        # in a worker thread while pip, which configures locale and logging
+        # process-wide, stays on the main thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            tools_future = executor.submit(self.check_system_tools)
+            python_ok = self.install_python_dependencies()
+            tools_ok = tools_future.result()
         
-        if not self.install_main_script():
+        if not (tools_ok and python_ok):
             return False
         
-        if not self.create_command_wrapper():
+        # Only touch the filesystem once the required tools are in place
+        if not self._setup_files():
             return False
         
         self.setup_bash_completion()
@@ -433,37 +638,65 @@ complete -F _snm_completion snm
             print("⚠️  Installation completed with warnings")
             return True
     
+    def _remove_path(self, path):
+        """Remove a file or directory tree, unlinking files in parallel"""
+        if path.is_symlink() or not path.is_dir():
+            path.unlink()
+            return
+        
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            for root, dirs, files in os.walk(path, topdown=False):
+                list(executor.map(os.unlink, [os.path.join(root, name) for name in files]))
+                for name in dirs:
+                    dir_path = os.path.join(root, name)
+                    if os.path.islink(dir_path):
+                        os.unlink(dir_path)
+                    else:
+                        os.rmdir(dir_path)
+        
+        path.rmdir()
+    
     def uninstall(self):
         """Uninstall SpeedNetworkMapper"""
         print("🗑️  Uninstalling SpeedNetworkMapper...")
         
-        try:
-            # Remove command
-            if self.bin_path.exists():
-                self.bin_path.unlink()
-                print(f"✅ Removed: {self.bin_path}")
-            
-            # Remove installation directory
-            if self.install_dir.exists():
-                shutil.rmtree(self.install_dir)
-                print(f"✅ Removed: {self.install_dir}")
-            
-            # Remove bash completion
-            if self.completion_script.exists():
-                self.completion_script.unlink()
-                print(f"✅ Removed: {self.completion_script}")
-            
-            print("✅ SpeedNetworkMapper uninstalled successfully")
-            print("💡 You may want to restart your terminal to clear bash completion")
-            return True
+        lines = []
+        
+        # Command, installation directory, bash completion and its word
+        # lists, and the tool lookup cache
+        targets = [path for path in (self.bin_path, self.install_dir,
+                                     self.completion_script, self.config_dir,
+                                     self.cache_dir)
+                   if path.exists()]
+        
+        errors = []
+        if targets:
+            with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+                futures = [executor.submit(self._remove_path, path) for path in targets]
             
-        except Exception as e:
-            print(f"❌ Error during uninstallation: {e}")
+            # Report every target that was removed, even if another failed
+            for path, future in zip(targets, futures):
+                error = future.exception()
+                if error is None:
+                    lines.append(f"✅ Removed: {path}")
+                else:
+                    errors.append(error)
+        
+        if errors:
+            self._write_lines(lines)
+            for error in errors:
+                print(f"❌ Error during uninstallation: {error}")
             return False
+        
+        lines.append("✅ SpeedNetworkMapper uninstalled successfully")
+        lines.append("💡 You may want to restart your terminal to clear bash completion")
+        self._write_lines(lines)
+        return True
 
 def main():
     """Main installer entry point"""
     installer = SNMInstaller()
+    installer.deep_test = '--deep-test' in sys.argv
     
     if len(sys.argv) > 1:
         if sys.argv[1] in ['-h', '--help']:
@@ -476,6 +709,7 @@ Usage:
 Options:
   install     Install SpeedNetworkMapper (default)
   uninstall   Remove SpeedNetworkMapper
+  --deep-test Run the installed command as part of the installation test
   -h, --help  Show this help message
 
 Installation Features:
@@ -8,23 +8,65 @@ Description: Lightning fast network discovery using native Linux tools and async
 """
 
 import asyncio
+import array
 import socket
 import struct
-import subprocess
 import threading
 import time
 import sys
 import os
 import re
+import io
 import json
+import csv
 import signal
+import shutil
+import fcntl
+import resource
 from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Dict, Set, Optional, Tuple, Any
 from datetime import datetime
 import ipaddress
 import platform
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Response time in ping output, matched on the raw bytes
+_PING_TIME_RE = re.compile(rb'time=(\d+\.?\d*)')
+
+# Well-known services by port
+SERVICE_MAP = {
+    21: "FTP", 22: "SSH", 23: "Telnet", 25: "SMTP", 53: "DNS",
+    80: "HTTP", 110: "POP3", 135: "RPC", 139: "NetBIOS", 143: "IMAP",
+    443: "HTTPS", 993: "IMAPS", 995: "POP3S", 1723: "PPTP", 3389: "RDP",
+    5900: "VNC", 8080: "HTTP-Alt"
+}
+
+# Ports that get an HTTP request before banner grabbing
+HTTP_PROBE_PORTS = frozenset({80, 8080, 8000, 8443})
+
+# OUI database lookup (simplified version), keyed by the 3 prefix bytes
+OUI_MAP = {
+    bytes.fromhex(oui.replace(':', '')): vendor
+    for oui, vendor in {
+        "00:50:56": "VMware",
+        "08:00:27": "VirtualBox",
+        "52:54:00": "QEMU/KVM",
+        "00:0C:29": "VMware",
+        "00:1C:42": "Parallels",
+        "00:15:5D": "Microsoft Hyper-V",
+        "A0:36:9F": "Apple",
+        "B8:27:EB": "Raspberry Pi",
+        "DC:A6:32": "Raspberry Pi",
+    }.items()
+}
+
 @dataclass
 class HostInfo:
     """Host information container"""
@@ -33,14 +75,14 @@ class HostInfo:
     mac: str = ""
     vendor: str = ""
     os: str = ""
-    ports: List[int] = None
+    ports: Set[int] = None
     services: Dict[int, str] = None
     response_time: float = 0.0
     last_seen: datetime = None
     
     def __post_init__(self):
         if self.ports is None:
-            self.ports = []
+            self.ports = set()
         if self.services is None:
             self.services = {}
         if self.last_seen is None:
@@ -49,6 +91,12 @@ class HostInfo:
 class SpeedNetworkMapper:
     """Ultra-fast network discovery and mapping tool"""
     
+    # Port fingerprints for OS detection
+    _WINDOWS_PORTS = frozenset({135, 139, 445})
+    _WEB_PORTS = frozenset({80, 443})
+    _ROUTER_PORTS = frozenset({23, 80, 443})
+    _MAC_PORTS = frozenset({548, 631})
+    
     def __init__(self):
         self.discovered_hosts: Dict[str, HostInfo] = {}
         self.scan_active = False
@@ -71,15 +119,92 @@ class SpeedNetworkMapper:
         self.ping_timeout = 1.0
         self.port_timeout = 0.5
         
+        # ICMP echo state, active only while a discovery sweep runs
+        self._icmp_sock = None
+        self._icmp_raw = False
+        self._icmp_ident = os.getpid() & 0xFFFF
+        self._icmp_seq = 0
+        self._icmp_pending: Dict[int, Tuple[str, float, asyncio.Future]] = {}
+        
+        # Export format requested on the command line, also used on shutdown
+        self.export_format: Optional[str] = None
+        self._shutting_down = False
+        
+        # Scan output, written to stdout in batches by a flush timer
+        self._out_buf = io.StringIO()
+        
+        # ARP table snapshot, reloaded for every scan
+        self._arp_table: Optional[Dict[str, str]] = None
+        
         print(self._get_banner())
     
+    def _install_signal_handlers(self):
+        """Route shutdown signals through the running event loop during a scan"""
+        loop = asyncio.get_running_loop()
+        scan_task = asyncio.current_task()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(
+                signum,
+                lambda signum=signum: asyncio.ensure_future(self._shutdown(signum, scan_task))
+            )
+    
+    async def _shutdown(self, signum: int, scan_task: asyncio.Task):
+        """Export what was found so far, then cancel the scan"""
+        # A second signal while already shutting down forces an exit
+        if self._shutting_down:
+            print(f"\n🛑 Received signal {signum} again, exiting immediately")
+            sys.stdout.flush()
+            os._exit(1)
+        self._shutting_down = True
+        
+        self._flush_output()
+        print(f"\n🛑 Received signal {signum}, shutting down gracefully...")
+        self.scan_active = False
+        try:
+            if self.export_format:
+                await self._export_results(self.export_format)
+        except Exception as e:
+            print(f"❌ Export failed: {e}")
+        finally:
+            self._display_final_stats()
+            scan_task.cancel()
+    
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully"""
+        self._flush_output()
         print(f"\n🛑 Received signal {signum}, shutting down gracefully...")
         self.scan_active = False
         self._display_final_stats()
         sys.exit(0)
     
+    def _emit(self, line: str):
+        """Queue a line of scan output for the next flush"""
+        self._out_buf.write(line + "\n")
+    
+    def _flush_output(self):
+        """Write queued scan output to stdout"""
+        output = self._out_buf.getvalue()
+        if output:
+            sys.stdout.write(output)
+            sys.stdout.flush()
+            self._out_buf.seek(0)
+            self._out_buf.truncate()
+    
+    @asynccontextmanager
+    async def _buffered_output(self, interval: float = 0.2):
+        """Buffer scan output and flush it on a timer instead of per line"""
+        async def flush_periodically():
+            while True:
+                await asyncio.sleep(interval)
+                self._flush_output()
+        
+        flusher = asyncio.ensure_future(flush_periodically())
+        try:
+            yield
+        finally:
+            flusher.cancel()
+            self._flush_output()
+    
     def _get_banner(self):
         """Get application banner"""
         return """
@@ -102,14 +227,7 @@ class SpeedNetworkMapper:
             return False
         
         required_tools = ['ping', 'nmap', 'arp', 'netstat']
-        missing_tools = []
-        
-        for tool in required_tools:
-            try:
-                subprocess.run(['which', tool], check=True, 
-                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            except subprocess.CalledProcessError:
-                missing_tools.append(tool)
+        missing_tools = [tool for tool in required_tools if shutil.which(tool) is None]
         
         if missing_tools:
             print(f"⚠️  Optional tools not found: {', '.join(missing_tools)}")
@@ -117,8 +235,204 @@ class SpeedNetworkMapper:
         
         return True
     
+    def _open_icmp_socket(self) -> bool:
+        """Open an ICMP socket, unprivileged ping socket first, raw socket second"""
+        for sock_type in (socket.SOCK_DGRAM, socket.SOCK_RAW):
+            try:
+                sock = socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP)
+            except OSError:
+                continue
+            
+            sock.setblocking(False)
+            self._icmp_sock = sock
+            self._icmp_raw = sock_type == socket.SOCK_RAW
+            return True
+        
+        return False
+    
+    def _close_icmp_socket(self):
+        """Close the ICMP socket and fail any outstanding echo requests"""
+        if self._icmp_sock is not None:
+            self._icmp_sock.close()
+            self._icmp_sock = None
+        self._icmp_pending.clear()
+    
+    @staticmethod
+    def _icmp_checksum(data: bytes) -> int:
+        """Internet checksum (RFC 1071) over 16-bit big-endian words"""
+        if len(data) % 2:
+            data += b'\x00'
+        words = array.array('H', data)
+        if sys.byteorder == 'little':
+            words.byteswap()
+        total = sum(words)
+        total = (total >> 16) + (total & 0xFFFF)
+        total += total >> 16
+        return ~total & 0xFFFF
+    
+    def _build_echo_request(self, seq: int) -> bytes:
+        """Build an ICMP Echo Request packet"""
+        payload = b'SpeedNetworkMapper'.ljust(32, b'\x00')
+        header = struct.pack('!BBHHH', 8, 0, 0, self._icmp_ident, seq)
+        checksum = self._icmp_checksum(header + payload)
+        return struct.pack('!BBHHH', 8, 0, checksum, self._icmp_ident, seq) + payload
+    
+    def _on_icmp_readable(self):
+        """Drain ICMP replies and resolve the matching echo requests"""
+        while True:
+            try:
+                packet, addr = self._icmp_sock.recvfrom(1024)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            
+            # Raw sockets deliver the IP header too
+            if self._icmp_raw:
+                packet = packet[(packet[0] & 0x0F) * 4:]
+            if len(packet) < 8:
+                continue
+            
+            icmp_type, _, _, ident, seq = struct.unpack('!BBHHH', packet[:8])
+            # Ping sockets rewrite the identifier and only see their own replies
+            if icmp_type != 0 or (self._icmp_raw and ident != self._icmp_ident):
+                continue
+            
+            pending = self._icmp_pending.get(seq)
+            if pending is None:
+                continue
+            ip, sent_at, future = pending
+            if addr[0] == ip and not future.done():
+                future.set_result((ip, (time.perf_counter() - sent_at) * 1000))
+    
+    async def _icmp_ping(self, ip: str) -> Optional[Tuple[str, float]]:
+        """Ping a host with an ICMP Echo Request over the shared socket"""
+        loop = asyncio.get_running_loop()
+        self._icmp_seq = (self._icmp_seq + 1) & 0xFFFF
+        seq = self._icmp_seq
+        future = loop.create_future()
+        
+        self._icmp_pending[seq] = (ip, time.perf_counter(), future)
+        try:
+            self._icmp_sock.sendto(self._build_echo_request(seq), (ip, 0))
+            return await asyncio.wait_for(future, timeout=self.ping_timeout)
+        except (asyncio.TimeoutError, OSError):
+            return None
+        finally:
+            self._icmp_pending.pop(seq, None)
+    
+    def _local_interface(self, network_obj: ipaddress.IPv4Network) -> Optional[Tuple[str, bytes, bytes]]:
+        """Find the interface a network is directly attached to as (name, MAC, IPv4)"""
+        try:
+            with open('/proc/net/route', 'r') as f:
+                next(f, None)  # Header
+                for line in f:
+                    # Iface, Destination, Gateway, Flags, RefCnt, Use, Metric, Mask, ...
+                    fields = line.split()
+                    if len(fields) < 8 or int(fields[2], 16) != 0:
+                        continue
+                    
+                    # Addresses are printed as native-endian hex of network-order values
+                    destination = socket.inet_ntoa(struct.pack('=I', int(fields[1], 16)))
+                    netmask = socket.inet_ntoa(struct.pack('=I', int(fields[7], 16)))
+                    route = ipaddress.IPv4Network(f"{destination}/{netmask}")
+                    if route.prefixlen == 0 or not network_obj.subnet_of(route):
+                        continue
+                    
+                    iface = fields[0]
+                    with open(f'/sys/class/net/{iface}/address', 'r') as mac_file:
+                        src_mac = bytes.fromhex(mac_file.read().strip().replace(':', ''))
+                    
+                    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                        ifreq = fcntl.ioctl(sock.fileno(), 0x8915,  # SIOCGIFADDR
+                                            struct.pack('256s', iface.encode()[:15]))
+                    
+                    if len(src_mac) == 6 and any(src_mac):
+                        return iface, src_mac, ifreq[20:24]
+        except (OSError, ValueError):
+            pass
+        
+        return None
+    
+    async def _arp_sweep_local(self, ip_list: List[str],
+                               interface: Tuple[str, bytes, bytes]) -> Optional[List[str]]:
+        """Discover hosts on a directly attached subnet with broadcast ARP requests"""
+        iface, src_mac, src_ip = interface
+        try:
+            sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(0x0806))
+        except (OSError, AttributeError):
+            return None  # Needs CAP_NET_RAW
+        
+        loop = asyncio.get_running_loop()
+        sent_at: Dict[str, float] = {}
+        found: Dict[str, str] = {}
+        alive_hosts = []
+        
+        own_ip = socket.inet_ntoa(src_ip)
+        
+        def on_readable():
+            while True:
+                try:
+                    frame = sock.recv(128)
+                except (BlockingIOError, InterruptedError):
+                    return
+                except OSError:
+                    return
+                
+                # Ethernet header, then an ARP reply (opcode 2)
+                if len(frame) < 42 or frame[12:14] != b'\x08\x06' or frame[20:22] != b'\x00\x02':
+                    continue
+                
+                ip = socket.inet_ntoa(frame[28:32])
+                if ip in sent_at and ip not in found:
+                    found[ip] = ':'.join(f'{b:02x}' for b in frame[22:28])
+                    response_time = (time.perf_counter() - sent_at[ip]) * 1000
+                    alive_hosts.append(ip)
+                    self.total_ips_scanned += 1
+                    self._emit(f"✅ {ip} ({response_time:.1f}ms)")
+        
+        try:
+            sock.bind((iface, 0x0806))
+            sock.setblocking(False)
+            loop.add_reader(sock.fileno(), on_readable)
+            
+            self._emit(f"⚡ ARP sweeping {len(ip_list)} hosts on {iface}...")
+            
+            # We never see an ARP reply from ourselves
+            if own_ip in ip_list:
+                alive_hosts.append(own_ip)
+                self.total_ips_scanned += 1
+                self._emit(f"✅ {own_ip} (local)")
+            
+            header = struct.pack('!6s6sH', b'\xff' * 6, src_mac, 0x0806)
+            batch = max(1, self.max_concurrent_hosts)
+            
+            for start in range(0, len(ip_list), batch):
+                for ip in ip_list[start:start + batch]:
+                    if ip == own_ip:
+                        continue
+                    request = struct.pack('!HHBBH6s4s6s4s', 1, 0x0800, 6, 4, 1,
+                                          src_mac, src_ip, b'\x00' * 6,
+                                          socket.inet_aton(ip))
+                    sent_at[ip] = time.perf_counter()
+                    sock.send((header + request).ljust(60, b'\x00'))
+                # Pace bursts like the concurrency limit would
+                await asyncio.sleep(0.01)
+            
+            # Collect late replies
+            await asyncio.sleep(self.ping_timeout)
+        except OSError:
+            return None
+        finally:
+            loop.remove_reader(sock.fileno())
+            sock.close()
+        
+        # MACs come for free, so there is no need to read the kernel ARP table
+        self._arp_table = found
+        return alive_hosts
+    
     async def _ping_host(self, ip: str) -> Optional[Tuple[str, float]]:
-        """Fast ping using async subprocess"""
+        """Fast ping using async subprocess (fallback without ICMP sockets)"""
         try:
             proc = await asyncio.create_subprocess_exec(
                 'ping', '-c', '1', '-W', '1', ip,
@@ -130,8 +444,7 @@ class SpeedNetworkMapper:
             
             if proc.returncode == 0:
                 # Extract response time
-                output = stdout.decode()
-                time_match = re.search(r'time=(\d+\.?\d*)', output)
+                time_match = _PING_TIME_RE.search(stdout)
                 response_time = float(time_match.group(1)) if time_match else 0.0
                 return ip, response_time
             
@@ -141,213 +454,253 @@ class SpeedNetworkMapper:
         return None
     
     async def _scan_port(self, ip: str, port: int) -> Optional[Tuple[int, str]]:
-        """Fast TCP port scan"""
+        """Fast TCP connect scan on a bare non-blocking socket
+        
+        Returns None for closed ports and raises asyncio.TimeoutError for
+        unanswered (filtered) ones, which the caller treats as congestion.
+        """
+        loop = asyncio.get_running_loop()
+        sock = None
+        
         try:
-            # Create connection with timeout
-            reader, writer = await asyncio.wait_for(
-                asyncio.open_connection(ip, port),
+            # No stream reader/writer/protocol, just the connect on the loop's selector
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            # Close with RST instead of FIN so probes never sit in TIME_WAIT
+            # and exhaust local ephemeral ports on large scans
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            await asyncio.wait_for(
+                loop.sock_connect(sock, (ip, port)),
                 timeout=self.port_timeout
             )
             
-            writer.close()
-            await writer.wait_closed()
-            
-            # Try to grab banner for service detection
-            service = await self._detect_service(ip, port)
+            # Grab the banner over the same connection
+            service = await self._detect_service(sock, port)
             return port, service
-            
-        except (asyncio.TimeoutError, ConnectionRefusedError, OSError):
-            pass
-        
-        return None
+        except asyncio.TimeoutError:
+            raise
+        except (ConnectionRefusedError, OSError):
+            return None
+        finally:
+            if sock is not None:
+                sock.close()
     
-    async def _detect_service(self, ip: str, port: int) -> str:
-        """Detect service running on port"""
-        service_map = {
-            21: "FTP", 22: "SSH", 23: "Telnet", 25: "SMTP", 53: "DNS",
-            80: "HTTP", 110: "POP3", 135: "RPC", 139: "NetBIOS", 143: "IMAP",
-            443: "HTTPS", 993: "IMAPS", 995: "POP3S", 1723: "PPTP", 3389: "RDP",
-            5900: "VNC", 8080: "HTTP-Alt"
-        }
-        
+    @staticmethod
+    async def _detect_service(sock: socket.socket, port: int) -> str:
+        """Detect service running on port of an already connected socket"""
         # Quick service mapping
-        if port in service_map:
-            return service_map[port]
+        service = SERVICE_MAP.get(port)
+        if service is not None:
+            return service
         
         # Try banner grabbing for unknown services
+        loop = asyncio.get_running_loop()
         try:
-            reader, writer = await asyncio.wait_for(
-                asyncio.open_connection(ip, port),
-                timeout=1.0
-            )
-            
-            # Send HTTP request for web services
-            if port in [80, 8080, 8000, 8443]:
-                writer.write(b"GET / HTTP/1.0\r\n\r\n")
-                await writer.drain()
+            # Send HTTP request for web services, flushed without Nagle delay
+            if port in HTTP_PROBE_PORTS:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                await loop.sock_sendall(sock, b"GET / HTTP/1.0\r\n\r\n")
             
             # Read banner
-            banner = await asyncio.wait_for(reader.read(1024), timeout=1.0)
-            writer.close()
-            
-            banner_str = banner.decode('utf-8', errors='ignore').strip()
-            if banner_str:
-                # Extract service info from banner
-                if 'SSH' in banner_str:
-                    return f"SSH ({banner_str[:50]})"
-                elif 'HTTP' in banner_str:
-                    return f"HTTP ({banner_str[:50]})"
-                elif 'FTP' in banner_str:
-                    return f"FTP ({banner_str[:50]})"
-                else:
-                    return f"Unknown ({banner_str[:30]})"
+            banner = await asyncio.wait_for(loop.sock_recv(sock, 1024), timeout=1.0)
+            return SpeedNetworkMapper._classify_banner(banner)
             
         except Exception:
             pass
         
         return "Unknown"
     
-    def _get_arp_info(self, ip: str) -> Tuple[str, str]:
-        """Get MAC address and vendor info from ARP table"""
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _classify_banner(banner: bytes) -> str:
+        """Extract service info from a banner (identical banners repeat across hosts)"""
+        banner_str = banner.decode('utf-8', errors='ignore').strip()
+        if not banner_str:
+            return "Unknown"
+        
+        if b'SSH' in banner:
+            return f"SSH ({banner_str[:50]})"
+        elif b'HTTP' in banner:
+            return f"HTTP ({banner_str[:50]})"
+        elif b'FTP' in banner:
+            return f"FTP ({banner_str[:50]})"
+        else:
+            return f"Unknown ({banner_str[:30]})"
+    
+    def _load_arp_table(self) -> Dict[str, str]:
+        """Read the kernel ARP table into an {ip: mac} map"""
+        table = {}
         try:
-            # Check ARP table
-            result = subprocess.run(['arp', '-n', ip], 
-                                  capture_output=True, text=True, timeout=2)
-            
-            if result.returncode == 0:
-                output = result.stdout.strip()
-                # Parse ARP output: IP (MAC) at MAC [ether] on interface
-                mac_match = re.search(r'([0-9a-fA-F]{2}[:-]){5}[0-9a-fA-F]{2}', output)
-                if mac_match:
-                    mac = mac_match.group(0)
-                    vendor = self._get_vendor_from_mac(mac)
-                    return mac, vendor
-            
-        except Exception:
+            with open('/proc/net/arp', 'r') as f:
+                next(f, None)  # Header
+                for line in f:
+                    # IP address, HW type, Flags, HW address, Mask, Device
+                    fields = line.split()
+                    if len(fields) >= 4 and fields[2] != '0x0':
+                        table[fields[0]] = fields[3]
+        except OSError:
             pass
         
+        return table
+    
+    def _get_arp_info(self, ip: str) -> Tuple[str, str]:
+        """Get MAC address and vendor info from ARP table"""
+        # Loaded once per scan, after discovery has populated the table
+        if self._arp_table is None:
+            self._arp_table = self._load_arp_table()
+        
+        mac = self._arp_table.get(ip, "")
+        if mac:
+            return mac, self._get_vendor_from_mac(mac)
         return "", ""
     
-    def _get_vendor_from_mac(self, mac: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _get_vendor_from_mac(mac: str) -> str:
         """Get vendor info from MAC address (simplified)"""
-        # OUI database lookup (simplified version)
-        oui_map = {
-            "00:50:56": "VMware",
-            "08:00:27": "VirtualBox",
-            "52:54:00": "QEMU/KVM",
-            "00:0C:29": "VMware",
-            "00:1C:42": "Parallels",
-            "00:15:5D": "Microsoft Hyper-V",
-            "A0:36:9F": "Apple",
-            "B8:27:EB": "Raspberry Pi",
-            "DC:A6:32": "Raspberry Pi",
-        }
-        
-        oui = mac[:8].upper()
-        return oui_map.get(oui, "Unknown")
+        try:
+            oui = bytes.fromhex(mac[:8].replace(':', '').replace('-', ''))
+        except ValueError:
+            return "Unknown"
+        return OUI_MAP.get(oui, "Unknown")
     
     def _detect_os(self, host_info: HostInfo) -> str:
         """Simple OS detection based on open ports and TTL"""
-        open_ports = set(host_info.ports)
+        open_ports = host_info.ports
         
         # Windows indicators
-        if {135, 139, 445} & open_ports:
+        if not self._WINDOWS_PORTS.isdisjoint(open_ports):
             if 3389 in open_ports:
                 return "Windows (RDP enabled)"
             return "Windows"
         
         # Linux indicators
         if 22 in open_ports:
-            if {80, 443} & open_ports:
+            if not self._WEB_PORTS.isdisjoint(open_ports):
                 return "Linux (Web server)"
             return "Linux/Unix"
         
         # Router/Network device indicators
-        if {23, 80, 443} & open_ports and len(open_ports) < 5:
+        if not self._ROUTER_PORTS.isdisjoint(open_ports) and len(open_ports) < 5:
             return "Network Device/Router"
         
         # Mac indicators
-        if {548, 631} & open_ports:
+        if not self._MAC_PORTS.isdisjoint(open_ports):
             return "macOS"
         
         return "Unknown"
     
-    async def _scan_host_ports(self, ip: str, port_list: List[int]) -> HostInfo:
-        """Scan all ports for a specific host"""
-        host_info = HostInfo(ip=ip)
-        
-        # Get hostname
-        try:
-            host_info.hostname = socket.gethostbyaddr(ip)[0]
-        except:
-            host_info.hostname = ""
+    async def _resolve_all(self, ips: List[str]) -> Dict[str, str]:
+        """Reverse-resolve hostnames for all hosts concurrently"""
+        loop = asyncio.get_running_loop()
+        lookups = 64
+        semaphore = asyncio.Semaphore(lookups)
         
-        # Get MAC and vendor info
-        host_info.mac, host_info.vendor = self._get_arp_info(ip)
+        def lookup_done(future):
+            # Frees the thread's slot once the lookup really finishes, even
+            # after its caller gave up waiting
+            semaphore.release()
+            if not future.cancelled():
+                future.exception()
         
-        # Scan ports concurrently
-        semaphore = asyncio.Semaphore(self.max_concurrent_ports)
-        
-        async def scan_with_semaphore(port):
-            async with semaphore:
-                return await self._scan_port(ip, port)
-        
-        tasks = [scan_with_semaphore(port) for port in port_list]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Process results
-        for result in results:
-            if isinstance(result, tuple) and result:
-                port, service = result
-                host_info.ports.append(port)
-                host_info.services[port] = service
-                self.total_ports_scanned += 1
-        
-        # Sort ports
-        host_info.ports.sort()
-        
-        # OS detection
-        host_info.os = self._detect_os(host_info)
+        async def resolve(ip):
+            await semaphore.acquire()
+            # One thread per slot, so the lookup starts immediately and the
+            # timeout only covers resolver time, not queueing
+            future = loop.run_in_executor(executor, socket.getnameinfo,
+                                          (ip, 0), socket.NI_NAMEREQD)
+            future.add_done_callback(lookup_done)
+            try:
+                hostname, _ = await asyncio.wait_for(asyncio.shield(future), timeout=0.5)
+                return hostname
+            except (asyncio.TimeoutError, OSError):
+                return ""
         
-        return host_info
+        executor = ThreadPoolExecutor(max_workers=lookups)
+        try:
+            hostnames = await asyncio.gather(*[resolve(ip) for ip in ips])
+        finally:
+            executor.shutdown(wait=False)
+        return dict(zip(ips, hostnames))
+    
+    def _socket_budget(self) -> int:
+        """Concurrent port probes allowed across all hosts"""
+        # Same ceiling as the old per-host limits (which stealth mode lowers),
+        # capped by the open file limit with headroom for everything else
+        budget = (self.max_concurrent_hosts // 2) * self.max_concurrent_ports
+        nofile = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+        return max(1, min(1024, nofile - 100, budget))
     
     async def _discovery_scan(self, network: str) -> List[str]:
         """Fast host discovery using ping sweep"""
-        print(f"🔍 Discovering hosts in {network}...")
+        self._emit(f"🔍 Discovering hosts in {network}...")
         
         try:
             network_obj = ipaddress.IPv4Network(network, strict=False)
-            ip_list = [str(ip) for ip in network_obj.hosts()]
         except ValueError:
-            print(f"❌ Invalid network format: {network}")
+            self._emit(f"❌ Invalid network format: {network}")
             return []
         
+        # Usable host range as integers, same as network_obj.hosts()
+        first = int(network_obj.network_address)
+        last = int(network_obj.broadcast_address)
+        if network_obj.prefixlen < 31:
+            first += 1
+            last -= 1
+        
         # Limit IP range for performance
-        if len(ip_list) > 1000:
-            print(f"⚠️  Large network detected ({len(ip_list)} IPs). Limiting to first 1000.")
-            ip_list = ip_list[:1000]
+        host_count = last - first + 1
+        if host_count > 1000:
+            self._emit(f"⚠️  Large network detected ({host_count} IPs). Limiting to first 1000.")
+            last = first + 999
+        
+        ip_list = [socket.inet_ntoa(struct.pack('!I', n)) for n in range(first, last + 1)]
+        
+        # Directly attached subnets are swept with ARP, which also yields MACs
+        interface = self._local_interface(network_obj)
+        if interface is not None:
+            alive_hosts = await self._arp_sweep_local(ip_list, interface)
+            if alive_hosts is not None:
+                self._emit(f"🎯 Found {len(alive_hosts)} alive hosts")
+                return alive_hosts
+        
+        # Concurrent ping sweep over one ICMP socket, or ping subprocesses
+        # when neither ping sockets nor raw sockets are permitted
+        loop = asyncio.get_running_loop()
+        if self._open_icmp_socket():
+            loop.add_reader(self._icmp_sock.fileno(), self._on_icmp_readable)
+            ping = self._icmp_ping
+        else:
+            ping = self._ping_host
         
-        # Concurrent ping sweep
         semaphore = asyncio.Semaphore(self.max_concurrent_hosts)
         
         async def ping_with_semaphore(ip):
             async with semaphore:
-                return await self._ping_host(ip)
+                try:
+                    return await ping(ip)
+                except Exception:
+                    return None
         
-        print(f"⚡ Pinging {len(ip_list)} hosts...")
-        tasks = [ping_with_semaphore(ip) for ip in ip_list]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        self._emit(f"⚡ Pinging {len(ip_list)} hosts...")
         
-        # Collect alive hosts
+        # Report alive hosts as soon as they answer
         alive_hosts = []
-        for result in results:
-            if isinstance(result, tuple) and result:
-                ip, response_time = result
-                alive_hosts.append(ip)
-                self.total_ips_scanned += 1
-                print(f"✅ {ip} ({response_time:.1f}ms)")
+        try:
+            for next_result in asyncio.as_completed([ping_with_semaphore(ip) for ip in ip_list]):
+                result = await next_result
+                if result:
+                    ip, response_time = result
+                    alive_hosts.append(ip)
+                    self.total_ips_scanned += 1
+                    self._emit(f"✅ {ip} ({response_time:.1f}ms)")
+        finally:
+            if self._icmp_sock is not None:
+                loop.remove_reader(self._icmp_sock.fileno())
+                self._close_icmp_socket()
         
-        print(f"🎯 Found {len(alive_hosts)} alive hosts")
+        self._emit(f"🎯 Found {len(alive_hosts)} alive hosts")
         return alive_hosts
     
     async def _full_scan(self, hosts: List[str], port_mode: str = 'quick'):
@@ -362,24 +715,95 @@ class SpeedNetworkMapper:
         }
         
         port_list = port_lists.get(port_mode, self.quick_ports)
-        print(f"🔎 Scanning {len(port_list)} ports on {len(hosts)} hosts...")
+        self._emit(f"🔎 Scanning {len(port_list)} ports on {len(hosts)} hosts...")
         
-        # Concurrent host scanning
-        semaphore = asyncio.Semaphore(self.max_concurrent_hosts // 2)  # Reduced for port scanning
+        # Resolve hostnames up front, off the event loop
+        hostnames = await self._resolve_all(hosts)
         
-        async def scan_host_with_semaphore(ip):
-            async with semaphore:
-                return await self._scan_host_ports(ip, port_list)
+        host_infos = {}
+        for ip in hosts:
+            host_info = HostInfo(ip=ip, hostname=hostnames[ip])
+            # Get MAC and vendor info
+            host_info.mac, host_info.vendor = self._get_arp_info(ip)
+            host_infos[ip] = host_info
+            # Stored right away so a shutdown mid-scan exports partial results
+            self.discovered_hosts[ip] = host_info
+        
+        # A pool of workers sized to the socket budget pulls (host, port)
+        # pairs from a shared iterator, so hosts with few ports don't leave
+        # sockets idle and memory stays O(concurrency) even for all 65535 ports.
+        # Ports are interleaved across hosts to spread the load.
+        targets = ((ip, port) for port in port_list for ip in hosts)
+        
+        # How many probes may be in flight adapts AIMD-style: +1 per answered
+        # probe, halved on timeouts (at most once per timeout window). Filtered
+        # ports time out too, so the budget never drops below the old per-host
+        # limits and adapting can only add concurrency.
+        ceiling = self._socket_budget()
+        floor = min(ceiling, len(hosts) * self.max_concurrent_ports)
+        budget = floor
+        last_decrease = 0.0
         
-        tasks = [scan_host_with_semaphore(ip) for ip in hosts]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # One worker per allowed probe: workers are spawned as the budget
+        # grows and retire when it shrinks, so none sit idle waiting
+        workers = set()
+        active = 0
         
-        # Store results
-        for result in results:
-            if isinstance(result, HostInfo):
-                self.discovered_hosts[result.ip] = result
-                if result.ports:
-                    print(f"🖥️  {result.ip} - {len(result.ports)} open ports - {result.os}")
+        def spawn():
+            nonlocal active
+            active += 1
+            workers.add(asyncio.ensure_future(worker()))
+        
+        async def worker():
+            nonlocal budget, active, last_decrease
+            try:
+                for ip, port in targets:
+                    result = None
+                    try:
+                        result = await self._scan_port(ip, port)
+                        budget = min(ceiling, budget + 1)
+                    except asyncio.TimeoutError:
+                        now = time.monotonic()
+                        if now - last_decrease >= self.port_timeout:
+                            budget = max(floor, budget // 2)
+                            last_decrease = now
+                    except Exception:
+                        pass
+                    
+                    if result:
+                        port, service = result
+                        host_infos[ip].ports.add(port)
+                        host_infos[ip].services[port] = service
+                        self.total_ports_scanned += 1
+                    
+                    if active > budget:
+                        break
+                    while active < budget:
+                        spawn()
+            finally:
+                active -= 1
+        
+        for _ in range(min(budget, len(hosts) * len(port_list))):
+            spawn()
+        try:
+            while workers:
+                done, _ = await asyncio.wait(workers)
+                workers -= done
+        finally:
+            for task in workers:
+                task.cancel()
+        self._emit(f"📶 Port probe concurrency settled at {budget}")
+        
+        # Finalize results
+        for host_info in host_infos.values():
+            # Order services by port (workers finish out of order)
+            host_info.services = {port: host_info.services[port] for port in sorted(host_info.ports)}
+            
+            # OS detection
+            host_info.os = self._detect_os(host_info)
+            
+            if host_info.ports:
+                self._emit(f"🖥️  {host_info.ip} - {len(host_info.ports)} open ports - {host_info.os}")
     
     def _display_results(self):
         """Display scan results in formatted output"""
@@ -419,7 +843,7 @@ class SpeedNetworkMapper:
                 print(f"   OS: {host.os}")
             
             if host.ports:
-                print(f"   Open Ports ({len(host.ports)}): {', '.join(map(str, host.ports[:10]))}")
+                print(f"   Open Ports ({len(host.ports)}): {', '.join(map(str, sorted(host.ports)[:10]))}")
                 if len(host.ports) > 10:
                     print(f"   ... and {len(host.ports) - 10} more")
                 
@@ -440,9 +864,33 @@ class SpeedNetworkMapper:
             print(f"   Hosts found: {len(self.discovered_hosts)}")
             print(f"   Average speed: {self.total_ips_scanned / duration:.1f} IPs/sec")
     
-    def _export_results(self, format_type: str = 'json'):
-        """Export results to file"""
-        if not self.discovered_hosts:
+    async def _export_results(self, format_type: str = 'json'):
+        """Export results to file without blocking the event loop"""
+        # Snapshot on the loop thread, scan workers may still be adding ports
+        data = self._export_snapshot()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._write_export, data, format_type)
+    
+    def _export_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Copy discovered hosts into plain dicts and lists for export"""
+        data = {}
+        for ip, host in self.discovered_hosts.items():
+            ports = sorted(host.ports)
+            data[ip] = {
+                'hostname': host.hostname,
+                'mac': host.mac,
+                'vendor': host.vendor,
+                'os': host.os,
+                'ports': ports,
+                'services': {port: host.services[port] for port in ports if port in host.services},
+                'response_time': host.response_time,
+                'last_seen': host.last_seen.isoformat()
+            }
+        return data
+    
+    def _write_export(self, data: Dict[str, Dict[str, Any]], format_type: str = 'json'):
+        """Export a results snapshot to file"""
+        if not data:
             print("❌ No results to export")
             return
         
@@ -450,36 +898,28 @@ class SpeedNetworkMapper:
         
         if format_type == 'json':
             filename = f"network_scan_{timestamp}.json"
-            data = {}
-            
-            for ip, host in self.discovered_hosts.items():
-                data[ip] = {
-                    'hostname': host.hostname,
-                    'mac': host.mac,
-                    'vendor': host.vendor,
-                    'os': host.os,
-                    'ports': host.ports,
-                    'services': host.services,
-                    'response_time': host.response_time,
-                    'last_seen': host.last_seen.isoformat()
-                }
             
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=2)
+            if orjson is not None:
+                with open(filename, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(filename, 'w') as f:
+                    json.dump(data, f, indent=2)
             
             print(f"💾 Results exported to {filename}")
         
         elif format_type == 'csv':
             filename = f"network_scan_{timestamp}.csv"
-            with open(filename, 'w') as f:
-                f.write("IP,Hostname,MAC,Vendor,OS,OpenPorts,Services\n")
+            with open(filename, 'w', newline='') as f:
+                writer = csv.writer(f, lineterminator='\n')
+                writer.writerow(["IP", "Hostname", "MAC", "Vendor", "OS", "OpenPorts", "Services"])
                 
-                for ip, host in self.discovered_hosts.items():
-                    ports_str = ';'.join(map(str, host.ports))
-                    services_str = ';'.join([f"{p}:{s}" for p, s in host.services.items()])
+                for ip, host in data.items():
+                    ports_str = ';'.join(map(str, host['ports']))
+                    services_str = ';'.join([f"{p}:{s}" for p, s in host['services'].items()])
                     
-                    f.write(f"{ip},{host.hostname},{host.mac},{host.vendor},"
-                           f"{host.os},{ports_str},{services_str}\n")
+                    writer.writerow([ip, host['hostname'], host['mac'], host['vendor'],
+                                     host['os'], ports_str, services_str])
             
             print(f"💾 Results exported to {filename}")
     
@@ -487,35 +927,51 @@ class SpeedNetworkMapper:
         """Quick network scan - discovery + quick port scan"""
         self.scan_active = True
         self.scan_start_time = time.time()
+        self._arp_table = None
+        self._shutting_down = False
+        self._install_signal_handlers()
         
         print(f"🚀 Starting quick scan of {network}")
         
-        # Host discovery
-        alive_hosts = await self._discovery_scan(network)
-        
-        if alive_hosts:
-            # Quick port scan
-            await self._full_scan(alive_hosts, 'quick')
+        async with self._buffered_output():
+            # Host discovery
+            alive_hosts = await self._discovery_scan(network)
+            
+            if alive_hosts:
+                # Quick port scan
+                await self._full_scan(alive_hosts, 'quick')
         
         self.scan_active = False
         self._display_results()
+        
+        # Export results if requested
+        if self.export_format:
+            await self._export_results(self.export_format)
     
     async def full_scan(self, network: str, port_mode: str = 'common'):
         """Full network scan - discovery + comprehensive port scan"""
         self.scan_active = True
         self.scan_start_time = time.time()
+        self._arp_table = None
+        self._shutting_down = False
+        self._install_signal_handlers()
         
         print(f"🚀 Starting full scan of {network} (ports: {port_mode})")
         
-        # Host discovery
-        alive_hosts = await self._discovery_scan(network)
-        
-        if alive_hosts:
-            # Full port scan
-            await self._full_scan(alive_hosts, port_mode)
+        async with self._buffered_output():
+            # Host discovery
+            alive_hosts = await self._discovery_scan(network)
+            
+            if alive_hosts:
+                # Full port scan
+                await self._full_scan(alive_hosts, port_mode)
         
         self.scan_active = False
         self._display_results()
+        
+        # Export results if requested
+        if self.export_format:
+            await self._export_results(self.export_format)
     
     async def stealth_scan(self, network: str):
         """Stealth scan with reduced speed for evasion"""
@@ -563,6 +1019,13 @@ Options:
         """)
         return
     
+    # libuv-based event loop, when available
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     scanner = SpeedNetworkMapper()
     
     if not scanner._check_requirements():
@@ -588,6 +1051,7 @@ Options:
             export_format = sys.argv[export_idx + 1]
         except (IndexError, ValueError):
             export_format = 'json'
+    scanner.export_format = export_format
     
     try:
         if command == 'quick':
@@ -601,11 +1065,9 @@ Options:
         else:
             print(f"❌ Unknown command: {command}")
             return
-        
-        # Export results if requested
-        if export_format:
-            scanner._export_results(export_format)
             
+    except asyncio.CancelledError:
+        pass  # Stopped by a signal, already reported and exported
     except KeyboardInterrupt:
         print("\n🛑 Scan interrupted by user")
     except Exception as e: